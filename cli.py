@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Command line entry point for the Trident spreadsheet importers.
+Reads every tab of the workbook once per process and hands the raw cells
+to each importer, so running several importers together parses the Excel
+file only once.
+"""
+import argparse
+import functools
+import os
+import sys
+from pathlib import Path
+
+from excel_io import read_raw_sheets
+from extract_properties import extract_excel_data, print_sheet_summary
+from parse_trident_properties import TRIDENT_WORKBOOK, parse_trident_properties
+
+@functools.lru_cache(maxsize=1)
+def _load(path):
+    """Read every tab once per process as raw cells; each importer applies its own header/dtype options"""
+    return read_raw_sheets(path)
+
+def extract_all(args):
+    properties = extract_excel_data(args.path, debug_csv=args.debug_csv, sheets=_load(args.path))
+    print_sheet_summary(properties)
+
+def parse_trident(args):
+    # On its own, read just the one tab (or its Parquet cache) rather than every tab
+    parse_trident_properties(args.path)
+
+def run_all(args):
+    extract_all(args)
+    parse_trident_properties(args.path, sheets=_load(args.path))
+
+def main():
+    parser = argparse.ArgumentParser(description="Import properties from the Trident workbook")
+    parser.add_argument("--path", default=TRIDENT_WORKBOOK, help="Path to the Excel workbook")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    extract_parser = subparsers.add_parser("extract-all", help="Extract every tab into all_properties.json")
+    extract_parser.set_defaults(func=extract_all)
+    
+    trident_parser = subparsers.add_parser("parse-trident", help="Parse List of Properties into trident_properties.json")
+    trident_parser.set_defaults(func=parse_trident)
+    
+    all_parser = subparsers.add_parser("all", help="Run extract-all and parse-trident from a single workbook read")
+    all_parser.set_defaults(func=run_all)
+    
+    for sub in (extract_parser, all_parser):
+        sub.add_argument("--debug-csv", action="store_true", default=bool(os.environ.get('EXTRACT_DEBUG_CSV')),
+                         help="Also dump each tab to properties_<tab>.csv")
+    
+    args = parser.parse_args()
+    
+    if not Path(args.path).exists():
+        print(f"❌ File not found: {args.path}")
+        sys.exit(1)
+    
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
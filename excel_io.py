@@ -0,0 +1,55 @@
+"""
+Shared Excel reading and JSON writing helpers for the spreadsheet importers
+"""
+import json
+from pathlib import Path
+
+import pandas as pd
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# pandas learned the calamine engine in 2.2; otherwise use openpyxl in read-only mode
+PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split('.')[:2])
+if CalamineWorkbook is not None and PANDAS_VERSION >= (2, 2):
+    EXCEL_ENGINE_OPTIONS = {'engine': 'calamine'}
+else:
+    EXCEL_ENGINE_OPTIONS = {'engine': 'openpyxl', 'engine_kwargs': {'read_only': True, 'data_only': True}}
+
+def read_excel_fast(excel_file_path, **kwargs):
+    """Read Excel with the calamine engine when available, otherwise openpyxl"""
+    return pd.read_excel(excel_file_path, **EXCEL_ENGINE_OPTIONS, **kwargs)
+
+def read_raw_sheets(excel_file_path):
+    """Read every tab once as untouched cell values, for frame_from_raw to parse"""
+    return read_excel_fast(excel_file_path, sheet_name=None, header=None, dtype=object, na_filter=False)
+
+def frame_from_raw(raw, **kwargs):
+    """Parse one read_raw_sheets tab the way read_excel would with the same options
+    (header, dtype, na_filter...), without reading the workbook again"""
+    try:
+        # The same TextParser call read_excel makes on the cell values it reads
+        return TextParser(raw.values.tolist(), skip_blank_lines=False, **kwargs).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+def write_json(path, data):
+    """Write JSON with orjson when available, falling back to the stdlib json module"""
+    if orjson is None:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+        return
+    
+    # Pass datetimes through to default=str so they keep the json.dump format
+    options = (orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+               | orjson.OPT_NON_STR_KEYS)
+    Path(path).write_bytes(orjson.dumps(data, default=str, option=options))
@@ -1,17 +1,25 @@
 #!/usr/bin/env python3
 import pandas as pd
-import json
 from pathlib import Path
 import sys
+import os
 
-def extract_excel_data(excel_file_path):
-    """Extract all tabs from Excel file and convert to structured data"""
+from excel_io import frame_from_raw, read_excel_fast, write_json
+
+def extract_excel_data(excel_file_path, debug_csv=False, sheets=None):
+    """Extract all tabs from Excel file and convert to structured data.
+    Set debug_csv to also dump each tab to properties_<tab>.csv for inspection.
+    Pass the read_raw_sheets result as sheets to reuse a workbook that's already been read."""
     
     print(f"📊 Reading Excel file: {excel_file_path}")
     
     try:
         # Read all sheets from Excel file
-        excel_data = pd.read_excel(excel_file_path, sheet_name=None, engine='openpyxl')
+        # na_filter=False keeps blank cells as '' instead of NaN, so no fillna pass is needed
+        if sheets is not None:
+            excel_data = {name: frame_from_raw(raw, header=0, na_filter=False) for name, raw in sheets.items()}
+        else:
+            excel_data = read_excel_fast(excel_file_path, sheet_name=None, na_filter=False)
         
         print(f"📋 Found {len(excel_data)} tabs:")
         for sheet_name in excel_data.keys():
@@ -27,9 +35,10 @@ def extract_excel_data(excel_file_path):
             print(df.head())
             
             # Convert to CSV for inspection
-            csv_filename = f"properties_{sheet_name.lower().replace(' ', '_')}.csv"
-            df.to_csv(csv_filename, index=False)
-            print(f"💾 Saved as: {csv_filename}")
+            if debug_csv:
+                csv_filename = f"properties_{sheet_name.lower().replace(' ', '_')}.csv"
+                df.to_csv(csv_filename, index=False, chunksize=65536)
+                print(f"💾 Saved as: {csv_filename}")
             
             # Try to standardize the data structure
             properties_from_sheet = process_sheet_data(df, sheet_name)
@@ -37,8 +46,7 @@ def extract_excel_data(excel_file_path):
         
         # Save consolidated data
         if all_properties:
-            with open('all_properties.json', 'w') as f:
-                json.dump(all_properties, f, indent=2, default=str)
+            write_json('all_properties.json', all_properties)
             print(f"\n✅ Consolidated {len(all_properties)} properties to all_properties.json")
         
         return all_properties
@@ -47,119 +55,84 @@ def extract_excel_data(excel_file_path):
         print(f"❌ Error reading Excel file: {e}")
         return None
 
+# Canonical property fields and the column-name tokens that identify them,
+# in priority order
+FIELD_COLUMN_TOKENS = {
+    'address': ['address', 'property_address', 'street_address', 'location', 'property'],
+    'client_name': ['client', 'seller', 'owner', 'client_name'],
+    'selling_agent': ['agent', 'listing_agent', 'selling_agent', 'realtor'],
+    'list_price': ['price', 'list_price', 'listing_price', 'asking_price', 'amount'],
+    'status': ['status', 'listing_status', 'property_status'],
+}
+
+def resolve_column_map(columns):
+    """Map each canonical field to the first matching sheet column"""
+    col_map = {}
+    cols_lower = [(col, str(col).lower()) for col in columns]
+    for field, tokens in FIELD_COLUMN_TOKENS.items():
+        for token in tokens:
+            match = next((col for col, col_lower in cols_lower if token in col_lower), None)
+            if match is not None:
+                col_map[field] = match
+                break
+    return col_map
+
+def default_status_for_sheet(sheet_name):
+    """Pick the fallback status implied by the sheet name"""
+    sheet_lower = sheet_name.lower()
+    if 'active' in sheet_lower:
+        return 'Active'
+    elif 'contract' in sheet_lower:
+        return 'Under Contract'
+    elif 'pending' in sheet_lower:
+        return 'Pending'
+    elif 'closed' in sheet_lower:
+        return 'Closed'
+    return 'Active'
+
 def process_sheet_data(df, sheet_name):
     """Process individual sheet data and standardize format"""
-    properties = []
     
-    # Clean up DataFrame
-    df = df.dropna(how='all')  # Remove completely empty rows
-    df = df.fillna('')  # Fill NaN with empty strings
+    # Remove completely empty rows (blank cells are read as '')
+    df = df[(df != '').any(axis=1)]
     
     print(f"📊 Processing {len(df)} rows from {sheet_name}")
     
-    for index, row in df.iterrows():
-        try:
-            # Try to map common column names
-            property_data = {
-                'source_sheet': sheet_name,
-                'row_number': index + 1,
-                'raw_data': row.to_dict()
-            }
-            
-            # Try to identify common real estate fields
-            row_dict = row.to_dict()
-            
-            # Look for address field
-            address_fields = ['address', 'property_address', 'street_address', 'location', 'property']
-            for field in address_fields:
-                for col in row_dict.keys():
-                    if field.lower() in str(col).lower():
-                        property_data['address'] = str(row_dict[col]).strip()
-                        break
-                if 'address' in property_data:
-                    break
-            
-            # Look for client/seller field
-            client_fields = ['client', 'seller', 'owner', 'client_name']
-            for field in client_fields:
-                for col in row_dict.keys():
-                    if field.lower() in str(col).lower():
-                        property_data['client_name'] = str(row_dict[col]).strip()
-                        break
-                if 'client_name' in property_data:
-                    break
-            
-            # Look for agent field
-            agent_fields = ['agent', 'listing_agent', 'selling_agent', 'realtor']
-            for field in agent_fields:
-                for col in row_dict.keys():
-                    if field.lower() in str(col).lower():
-                        property_data['selling_agent'] = str(row_dict[col]).strip()
-                        break
-                if 'selling_agent' in property_data:
-                    break
-            
-            # Look for price field
-            price_fields = ['price', 'list_price', 'listing_price', 'asking_price', 'amount']
-            for field in price_fields:
-                for col in row_dict.keys():
-                    if field.lower() in str(col).lower():
-                        price_val = str(row_dict[col]).replace('$', '').replace(',', '').strip()
-                        try:
-                            property_data['list_price'] = float(price_val) if price_val else None
-                        except:
-                            property_data['list_price'] = price_val
-                        break
-                if 'list_price' in property_data:
-                    break
-            
-            # Look for status field
-            status_fields = ['status', 'listing_status', 'property_status']
-            for field in status_fields:
-                for col in row_dict.keys():
-                    if field.lower() in str(col).lower():
-                        property_data['status'] = str(row_dict[col]).strip()
-                        break
-                if 'status' in property_data:
-                    break
-            
-            # Determine workflow type based on sheet name or data
-            if 'investor' in sheet_name.lower():
-                property_data['workflow_type'] = 'Investor'
-            else:
-                property_data['workflow_type'] = 'Conventional'
-            
-            # Set default status based on sheet name
-            if 'status' not in property_data or not property_data['status']:
-                if 'active' in sheet_name.lower():
-                    property_data['status'] = 'Active'
-                elif 'contract' in sheet_name.lower():
-                    property_data['status'] = 'Under Contract'
-                elif 'pending' in sheet_name.lower():
-                    property_data['status'] = 'Pending'
-                elif 'closed' in sheet_name.lower():
-                    property_data['status'] = 'Closed'
-                else:
-                    property_data['status'] = 'Active'
-            
-            properties.append(property_data)
-            
-        except Exception as e:
-            print(f"⚠️ Error processing row {index + 1}: {e}")
-            continue
+    # Resolve column names once for the whole sheet
+    col_map = resolve_column_map(df.columns)
     
-    print(f"✅ Processed {len(properties)} properties from {sheet_name}")
-    return properties
-
-if __name__ == "__main__":
-    excel_file = "Listed_properties/Trident Properties.xlsx"
+    out = pd.DataFrame(index=df.index)
+    out['source_sheet'] = sheet_name
+    out['row_number'] = df.index + 1
+    out['raw_data'] = df.to_dict(orient='records')
     
-    if not Path(excel_file).exists():
-        print(f"❌ File not found: {excel_file}")
-        sys.exit(1)
+    for field in ('address', 'client_name', 'selling_agent'):
+        if field in col_map:
+            out[field] = df[col_map[field]].astype(str).str.strip()
+    
+    if 'list_price' in col_map:
+        price_str = df[col_map['list_price']].astype(str).str.replace(r'[\$,]', '', regex=True).str.strip()
+        price = pd.to_numeric(price_str, errors='coerce').astype(float).astype(object)
+        # Keep unparseable values as-is, blanks become None
+        out['list_price'] = price.where(price.notna(), price_str.astype(object).where(price_str != '', None))
+    
+    # Fall back to a status based on sheet name
+    default_status = default_status_for_sheet(sheet_name)
+    if 'status' in col_map:
+        out['status'] = df[col_map['status']].astype(str).str.strip().replace('', default_status)
+    else:
+        out['status'] = default_status
+    
+    # Determine workflow type based on sheet name
+    out['workflow_type'] = 'Investor' if 'investor' in sheet_name.lower() else 'Conventional'
     
-    properties = extract_excel_data(excel_file)
+    properties = out.to_dict(orient='records')
     
+    print(f"✅ Processed {len(properties)} properties from {sheet_name}")
+    return properties
+
+def print_sheet_summary(properties):
+    """Print how many properties were extracted from each sheet"""
     if properties:
         print(f"\n🎉 Successfully extracted {len(properties)} properties!")
         print("\n📋 Summary by sheet:")
@@ -173,4 +146,16 @@ if __name__ == "__main__":
         for sheet, count in sheets.items():
             print(f"   - {sheet}: {count} properties")
     else:
-        print("❌ No properties extracted")
\ No newline at end of file
+        print("❌ No properties extracted")
+
+if __name__ == "__main__":
+    excel_file = "Listed_properties/Trident Properties.xlsx"
+    
+    if not Path(excel_file).exists():
+        print(f"❌ File not found: {excel_file}")
+        sys.exit(1)
+    
+    debug_csv = '--debug-csv' in sys.argv[1:] or bool(os.environ.get('EXTRACT_DEBUG_CSV'))
+    properties = extract_excel_data(excel_file, debug_csv=debug_csv)
+    
+    print_sheet_summary(properties)
\ No newline at end of file
@@ -1,23 +1,138 @@
 #!/usr/bin/env python3
 import pandas as pd
-import json
+import numpy as np
 import re
 from datetime import datetime
 import uuid
+import hashlib
+from pathlib import Path
 
-def parse_trident_properties():
+from excel_io import frame_from_raw, read_excel_fast, write_json
+
+TRIDENT_WORKBOOK = "Listed_properties/Trident Properties.xlsx"
+
+# read_excel options for the List of Properties tab
+PROPERTIES_READ_OPTIONS = {
+    'sheet_name': "List of Properties",
+    'header': 1,
+    'dtype': {'Address': str, 'Status': str, 'Single/Multi': str},
+}
+
+# Bump when the post-read normalization in read_properties_sheet changes
+PROPERTIES_CACHE_VERSION = 1
+
+# Patterns for the 'Basis Points/Loan number' column
+LOAN_RE = re.compile(r'loan #?(\d+)', re.IGNORECASE)
+BASIS_RE = re.compile(r'basis.*?\$?([\d,]+)', re.IGNORECASE)
+
+# Spreadsheet status values (lowercased) mapped to dashboard statuses
+STATUS_MAP = {
+    'pre': 'Hold',  # Pre-listing is essentially on hold
+    'hold': 'Hold',
+    'uc': 'Under Contract',
+    'under contract': 'Under Contract',
+    'active': 'Active',
+    'pending': 'Pending',
+    'closed': 'Closed',
+    'nan': 'Active',
+    '': 'Active'
+}
+
+# One key task per status: (task id suffix, static task fields)
+TASK_TEMPLATES = {
+    'Hold': ('_task_1', {
+        'title': 'Complete Pre-Listing Preparation',
+        'description': 'Property is on hold - complete all pre-listing requirements',
+        'priority': 'High',
+        'status': 'Pending',
+        'category': 'Listing Prep',
+        'taskType': 'listing-prep',
+        'isAutoGenerated': True
+    }),
+    'Active': ('_task_2', {
+        'title': 'Monitor Active Listing Performance',
+        'description': 'Track showing activity and market response',
+        'priority': 'Medium',
+        'status': 'Pending',
+        'category': 'Listing Prep',
+        'taskType': 'listing-prep',
+        'isAutoGenerated': True
+    }),
+    'Under Contract': ('_task_3', {
+        'title': 'Manage Contract Contingencies',
+        'description': 'Track inspection, appraisal, and financing deadlines',
+        'priority': 'Urgent',
+        'status': 'Pending',
+        'category': 'Under Contract',
+        'taskType': 'under-contract',
+        'isAutoGenerated': True
+    }),
+}
+
+def read_properties_sheet(excel_file_path, sheets=None):
+    """Read the List of Properties tab, reusing a Parquet cache built from the same workbook.
+    Pass the read_raw_sheets result as sheets to reuse a workbook that's already been read."""
+    excel_path = Path(excel_file_path)
+    cache_path = excel_path.with_suffix('.cache.parquet')
+    
+    # Identify the workbook by mtime and size rather than comparing timestamps,
+    # which coarse filesystem clocks can make equal
+    stat = excel_path.stat()
+    # Also key on the read options so changing them invalidates old caches
+    cache_key = hashlib.sha1(repr((PROPERTIES_CACHE_VERSION, PROPERTIES_READ_OPTIONS)).encode()).hexdigest()
+    source_metadata = {
+        b'source_mtime_ns': str(stat.st_mtime_ns).encode(),
+        b'source_size': str(stat.st_size).encode(),
+        b'cache_key': cache_key.encode(),
+    }
+    
+    if cache_path.exists():
+        try:
+            import pyarrow.parquet as pq
+            cache_metadata = pq.read_schema(cache_path).metadata or {}
+            if all(cache_metadata.get(key) == value for key, value in source_metadata.items()):
+                return pq.read_table(cache_path).to_pandas()
+        except ImportError:
+            pass  # pyarrow not installed, read the workbook instead
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cache {cache_path}: {e}")
+    
+    if sheets is not None:
+        options = dict(PROPERTIES_READ_OPTIONS)
+        df = frame_from_raw(sheets[options.pop('sheet_name')], **options)
+    else:
+        df = read_excel_fast(excel_path, **PROPERTIES_READ_OPTIONS)
+    
+    # Mixed-type columns (e.g. 'UC $' holds both 40000 and '130K') can't be stored
+    # in Parquet; every consumer stringifies them anyway
+    for col in [c for c in df.columns if df[c].dtype == object]:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **source_metadata})
+        pq.write_table(table, cache_path, compression='zstd')
+    except ImportError:
+        pass  # pyarrow not installed, skip caching
+    except Exception as e:
+        print(f"⚠️ Could not write cache {cache_path}: {e}")
+    
+    return df
+
+def parse_trident_properties(excel_file_path=TRIDENT_WORKBOOK, sheets=None):
     """Parse the main List of Properties tab into our property format"""
     
     print("🏠 Parsing Trident Properties data...")
     
     # Read the main properties list
-    df = pd.read_excel("Listed_properties/Trident Properties.xlsx", sheet_name="List of Properties", header=1)
+    df = read_properties_sheet(excel_file_path, sheets)
     
     print(f"📊 Found {len(df)} properties in main list")
     print(f"Columns: {list(df.columns)}")
     
     properties = []
-    tasks = []
     
     # Map the column names
     column_map = {
@@ -34,42 +149,62 @@ def parse_trident_properties():
         'Rent': 'rent_amount'
     }
     
-    for index, row in df.iterrows():
+    now = datetime.now()
+    now_iso = now.isoformat()
+    
+    # Parse price columns up front, indexed by row position
+    current_prices = parse_price_column(df, 'Current List')
+    starting_prices = parse_price_column(df, 'Starting List Price')
+    under_contract_prices = parse_price_column(df, 'UC $')
+    
+    # Normalize statuses up front
+    statuses = parse_status_column(df)
+    
+    # Parse date columns up front
+    listing_dates = parse_date_column(df, 'Listing Date')
+    closing_dates = parse_date_column(df, 'Closing')
+    
+    # Geocoding (rough estimate for St. Louis area)
+    addresses = df['Address'] if 'Address' in df.columns else pd.Series('', index=df.index)
+    coordinates_by_row = get_stl_coordinates(addresses.astype(str).str.strip())
+    
+    # Plain tuples are much cheaper than iterrows' per-row Series; position 0 is the index
+    col_idx = {col: i + 1 for i, col in enumerate(df.columns)}
+    
+    def cell(row, column, default=None):
+        return row[col_idx[column]] if column in col_idx else default
+    
+    for pos, row in enumerate(df.itertuples(index=True, name=None)):
+        index = row[0]
         try:
             # Skip empty rows
-            if pd.isna(row.get('Address')) or not str(row.get('Address')).strip():
+            if pd.isna(cell(row, 'Address')) or not str(cell(row, 'Address')).strip():
                 continue
             
             # Generate property ID
             property_id = str(uuid.uuid4())
             
             # Parse address
-            address = str(row['Address']).strip()
+            address = str(cell(row, 'Address')).strip()
             if not address or address.lower() == 'nan':
                 continue
             
             # Parse status
-            status = str(row.get('Status', 'Active')).strip()
-            if status.lower() == 'pre':
-                status = 'Hold'  # Pre-listing is essentially on hold
-            elif status.lower() == 'uc' or 'contract' in status.lower():
-                status = 'Under Contract'
-            elif status.lower() == 'nan' or not status:
-                status = 'Active'
+            status = statuses[pos]
             
             # Parse loan info and basis points
-            loan_info = str(row.get('Basis Points/Loan number', '')).strip()
+            loan_info = str(cell(row, 'Basis Points/Loan number', '')).strip()
             loan_number = None
             basis_points = None
             
             if loan_info and loan_info.lower() != 'nan':
                 # Extract loan number
-                loan_match = re.search(r'loan #?(\d+)', loan_info, re.IGNORECASE)
+                loan_match = LOAN_RE.search(loan_info)
                 if loan_match:
                     loan_number = f"LN-{loan_match.group(1)}"
                 
                 # Extract basis points/cost
-                basis_match = re.search(r'basis.*?[\$]?([\d,]+)', loan_info, re.IGNORECASE)
+                basis_match = BASIS_RE.search(loan_info)
                 if basis_match:
                     try:
                         basis_points = int(float(basis_match.group(1).replace(',', '')))
@@ -77,7 +212,7 @@ def parse_trident_properties():
                         pass
             
             # Parse property type
-            prop_type_raw = str(row.get('Single/Multi', 'Single')).strip().lower()
+            prop_type_raw = str(cell(row, 'Single/Multi', 'Single')).strip().lower()
             if 'single' in prop_type_raw:
                 property_type = 'Single Family'
             elif 'duplex' in prop_type_raw or '2 family' in prop_type_raw:
@@ -91,20 +226,19 @@ def parse_trident_properties():
             workflow_type = 'Investor' if property_type in ['Duplex', 'Commercial'] else 'Conventional'
             
             # Parse prices
-            current_price = parse_price(row.get('Current List'))
-            starting_price = parse_price(row.get('Starting List Price'))
-            under_contract_price = parse_price(row.get('UC $'))
+            current_price = current_prices[pos]
+            starting_price = starting_prices[pos]
+            under_contract_price = under_contract_prices[pos]
             
             # Parse dates
-            listing_date = parse_date(row.get('Listing Date'))
-            closing_date = parse_date(row.get('Closing'))
+            listing_date = listing_dates[pos]
+            closing_date = closing_dates[pos]
             
             # Parse rental info
-            is_rented = str(row.get('Rented', '')).strip().lower()
+            is_rented = str(cell(row, 'Rented', '')).strip().lower()
             is_rented = is_rented in ['y', 'yes', 'true', '1']
             
-            # Geocoding (rough estimate for St. Louis area)
-            coordinates = get_stl_coordinates(address)
+            coordinates = coordinates_by_row[pos]
             
             # Create property object
             property_obj = {
@@ -125,27 +259,25 @@ def parse_trident_properties():
                 'notes': f"Imported from Trident Properties spreadsheet. Original loan info: {loan_info}",
                 'coordinates': coordinates,
                 'listingDate': listing_date,
-                'createdAt': datetime.now().isoformat(),
-                'updatedAt': datetime.now().isoformat()
+                'createdAt': now_iso,
+                'updatedAt': now_iso
             }
             
             properties.append(property_obj)
             
-            # Generate basic tasks based on status
-            property_tasks = generate_tasks_for_property(property_obj)
-            tasks.extend(property_tasks)
-            
             print(f"✅ {address} - {status} - {property_type} ({workflow_type})")
             
         except Exception as e:
             print(f"❌ Error processing row {index}: {e}")
             continue
     
+    # Generate basic tasks based on status
+    tasks = generate_tasks(properties, now.strftime('%Y-%m-%d'))
+    
     print(f"\n🎉 Successfully parsed {len(properties)} properties and generated {len(tasks)} tasks!")
     
     # Save the data
-    with open('trident_properties.json', 'w') as f:
-        json.dump({'properties': properties, 'tasks': tasks}, f, indent=2, default=str)
+    write_json('trident_properties.json', {'properties': properties, 'tasks': tasks})
     
     print("💾 Saved to trident_properties.json")
     
@@ -161,109 +293,86 @@ def parse_trident_properties():
     
     return properties, tasks
 
-def parse_price(price_value):
-    """Parse price from various formats"""
-    if pd.isna(price_value) or not str(price_value).strip():
-        return None
+def parse_price_column(df, column):
+    """Parse a price column from various formats into a list of ints/None"""
+    if column not in df.columns:
+        return [None] * len(df)
     
-    price_str = str(price_value).replace('$', '').replace(',', '').strip()
+    price_str = df[column].astype(str).str.replace(r'[$,]', '', regex=True).str.strip()
     
     # Handle 'K' notation
-    if price_str.lower().endswith('k'):
-        try:
-            return int(float(price_str[:-1]) * 1000)
-        except:
-            return None
+    is_thousands = price_str.str.lower().str.endswith('k')
+    number_str = price_str.where(~is_thousands, price_str.str[:-1])
+
+    # to_numeric only picks out the parseable values; its fast parser drops precision on long digit strings
+    valid = pd.to_numeric(number_str, errors='coerce').notna()
+    base = pd.Series(np.nan, index=number_str.index)
+    base[valid] = number_str[valid].astype(float)
+    prices = base.where(~is_thousands, base * 1000)
     
-    try:
-        return int(float(price_str))
-    except:
-        return None
+    # int() rather than an Int64 cast, which can't hold values beyond the int64 range
+    return [int(price) if np.isfinite(price) else None for price in prices.tolist()]
 
-def parse_date(date_value):
-    """Parse date from various formats"""
-    if pd.isna(date_value):
-        return None
+def parse_status_column(df):
+    """Normalize the Status column into a list of dashboard statuses"""
+    if 'Status' not in df.columns:
+        return ['Active'] * len(df)
     
-    if isinstance(date_value, datetime):
-        return date_value.strftime('%Y-%m-%d')
+    raw = df['Status'].fillna('').astype(str).str.strip()
+    status_lower = raw.str.lower()
     
-    date_str = str(date_value).strip()
-    if not date_str or date_str.lower() == 'nan':
-        return None
+    # Unknown values containing 'contract' are under contract, anything else is kept as written
+    fallback = raw.where(~status_lower.str.contains('contract', regex=False), 'Under Contract')
+    statuses = status_lower.map(STATUS_MAP)
+    return statuses.where(statuses.notna(), fallback).tolist()
+
+def parse_date_column(df, column):
+    """Parse a date column from various formats into a list of 'YYYY-MM-DD' strings/None"""
+    if column not in df.columns:
+        return [None] * len(df)
     
-    # Try to parse common date formats
-    for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y', '%Y/%m/%d']:
-        try:
-            parsed_date = datetime.strptime(date_str.split()[0], fmt)
-            return parsed_date.strftime('%Y-%m-%d')
-        except:
-            continue
+    values = df[column]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values
+    else:
+        # Mixed column: keep real datetimes, then try common string formats
+        is_datetime = values.map(lambda v: isinstance(v, datetime))
+        dates = pd.to_datetime(values.where(is_datetime), errors='coerce')
+        first_token = values.astype(str).str.strip().str.split().str[0]
+        for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y', '%Y/%m/%d']:
+            dates = dates.fillna(pd.to_datetime(first_token, format=fmt, errors='coerce'))
     
-    return None
+    formatted = dates.dt.strftime('%Y-%m-%d').astype(object)
+    return formatted.where(dates.notna(), None).tolist()
 
-def get_stl_coordinates(address):
-    """Get approximate coordinates for St. Louis area addresses"""
+def get_stl_coordinates(addresses):
+    """Get approximate coordinates for a Series of St. Louis area addresses"""
     # Default to St. Louis area coordinates with slight variation
     base_lat = 38.6270
     base_lng = -90.1994
     
-    # Add some variation based on address hash
-    hash_val = hash(address) % 1000
+    # Add some variation based on a deterministic address hash
+    hash_val = pd.util.hash_pandas_object(addresses.astype(str), index=False).to_numpy() % 1000
     lat_offset = (hash_val % 100) * 0.001 - 0.05
     lng_offset = ((hash_val // 100) % 100) * 0.001 - 0.05
     
-    return {
-        'lat': round(base_lat + lat_offset, 6),
-        'lng': round(base_lng + lng_offset, 6)
-    }
+    lats = np.round(base_lat + lat_offset, 6).tolist()
+    lngs = np.round(base_lng + lng_offset, 6).tolist()
+    return [{'lat': lat, 'lng': lng} for lat, lng in zip(lats, lngs)]
 
-def generate_tasks_for_property(property_obj):
-    """Generate basic tasks based on property status"""
+def generate_tasks(properties, due_date):
+    """Generate basic tasks for all properties based on their status"""
     tasks = []
-    property_id = property_obj['id']
-    
-    # Generate a few key tasks based on status
-    if property_obj['status'] == 'Hold':
-        tasks.append({
-            'id': f"{property_id}_task_1",
-            'title': 'Complete Pre-Listing Preparation',
-            'description': 'Property is on hold - complete all pre-listing requirements',
-            'dueDate': (datetime.now().strftime('%Y-%m-%d')),
-            'priority': 'High',
-            'status': 'Pending',
-            'category': 'Listing Prep',
-            'propertyId': property_id,
-            'taskType': 'listing-prep',
-            'isAutoGenerated': True
-        })
-    elif property_obj['status'] == 'Active':
-        tasks.append({
-            'id': f"{property_id}_task_2",
-            'title': 'Monitor Active Listing Performance',
-            'description': 'Track showing activity and market response',
-            'dueDate': (datetime.now().strftime('%Y-%m-%d')),
-            'priority': 'Medium',
-            'status': 'Pending',
-            'category': 'Listing Prep',
-            'propertyId': property_id,
-            'taskType': 'listing-prep',
-            'isAutoGenerated': True
-        })
-    elif property_obj['status'] == 'Under Contract':
+    for property_obj in properties:
+        if property_obj['status'] not in TASK_TEMPLATES:
+            continue
+        id_suffix, template = TASK_TEMPLATES[property_obj['status']]
         tasks.append({
-            'id': f"{property_id}_task_3",
-            'title': 'Manage Contract Contingencies',
-            'description': 'Track inspection, appraisal, and financing deadlines',
-            'dueDate': (datetime.now().strftime('%Y-%m-%d')),
-            'priority': 'Urgent',
-            'status': 'Pending',
-            'category': 'Under Contract',
-            'propertyId': property_id,
-            'taskType': 'under-contract',
-            'isAutoGenerated': True
+            'id': f"{property_obj['id']}{id_suffix}",
+            **template,
+            'dueDate': due_date,
+            'propertyId': property_obj['id']
         })
-    
     return tasks
 
 if __name__ == "__main__":
@@ -1,29 +1,70 @@
 #!/usr/bin/env python3
 """
 PDF Plumber-based text extraction for problematic PDFs
-This script provides robust PDF text extraction using pdfplumber
+This script provides robust PDF text extraction using pdfplumber, trying
+PyMuPDF first for plain text since it is much faster
 """
 
 import sys
+import os
 import json
+import argparse
 import pdfplumber
 import io
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 
-def extract_pdf_text(pdf_path_or_bytes):
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24.3
+    except ImportError:
+        pymupdf = None
+
+# Below this many pages the process pool startup costs more than it saves
+PARALLEL_PAGE_THRESHOLD = 4
+
+def extract_pdf_text(pdf_path_or_bytes, extract_tables=False):
     """
-    Extract text from PDF using pdfplumber
+    Extract text from PDF, using PyMuPDF for text-only runs and pdfplumber
+    for tables or when PyMuPDF fails or finds no text
     """
     try:
         if isinstance(pdf_path_or_bytes, str):
             # File path provided
+            if not extract_tables:
+                result = extract_with_pymupdf(pdf_path_or_bytes)
+                if result:
+                    return result
+            
             with pdfplumber.open(pdf_path_or_bytes) as pdf:
-                return extract_from_pdf_object(pdf)
+                page_count = len(pdf.pages)
+                if page_count < PARALLEL_PAGE_THRESHOLD:
+                    return extract_from_pdf_object(pdf, extract_tables)
+            return extract_in_parallel((pdf_path_or_bytes, None, 0), page_count, extract_tables)
         else:
             # Bytes provided via stdin
             pdf_bytes = sys.stdin.buffer.read()
+            if not extract_tables:
+                result = extract_with_pymupdf(pdf_bytes)
+                if result:
+                    return result
+            
             with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                return extract_from_pdf_object(pdf)
+                page_count = len(pdf.pages)
+                if page_count < PARALLEL_PAGE_THRESHOLD:
+                    return extract_from_pdf_object(pdf, extract_tables)
+            
+            # Share the bytes with workers instead of pickling them per task
+            shm = SharedMemory(create=True, size=len(pdf_bytes))
+            try:
+                shm.buf[:len(pdf_bytes)] = pdf_bytes
+                return extract_in_parallel((None, shm.name, len(pdf_bytes)), page_count, extract_tables)
+            finally:
+                shm.close()
+                shm.unlink()
     except Exception as e:
         return {
             "success": False,
@@ -31,20 +72,91 @@ def extract_pdf_text(pdf_path_or_bytes):
             "traceback": traceback.format_exc()
         }
 
-def extract_from_pdf_object(pdf):
+def extract_with_pymupdf(pdf_path_or_bytes):
     """
-    Extract text and metadata from pdfplumber PDF object
+    Extract text with PyMuPDF. Returns None when it isn't installed, fails,
+    or finds no text, so the caller can fall back to pdfplumber.
     """
-    pages_data = []
-    total_text = ""
+    if pymupdf is None:
+        return None
+    
+    try:
+        # Keep MuPDF's own error messages off the console; pdfplumber gets a go anyway
+        pymupdf.TOOLS.mupdf_display_errors(False)
+        if isinstance(pdf_path_or_bytes, str):
+            doc = pymupdf.open(pdf_path_or_bytes)
+        else:
+            doc = pymupdf.open(stream=pdf_path_or_bytes, filetype="pdf")
+        
+        with doc:
+            pages_data = []
+            for page_num, page in enumerate(doc):
+                # PyMuPDF ends each page with a newline, pdfplumber doesn't
+                page_text = page.get_text("text").rstrip()
+                pages_data.append({
+                    "page_number": page_num + 1,
+                    "text": page_text,
+                    "tables": [],
+                    "char_count": len(page_text)
+                })
+    except Exception:
+        return None
     
-    for page_num, page in enumerate(pdf.pages):
+    result = build_result(pages_data)
+    return result if result["metadata"]["has_text"] else None
+
+def extract_in_parallel(source, page_count, extract_tables=False):
+    """
+    Extract pages across a process pool, one contiguous page range per worker
+    """
+    workers = min(os.cpu_count() or 1, page_count)
+    chunk_size = -(-page_count // workers)
+    ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(extract_page_range, source, start, stop, extract_tables) for start, stop in ranges]
+        pages_data = [page_data for future in futures for page_data in future.result()]
+    
+    pages_data.sort(key=lambda p: p["page_number"])
+    return build_result(pages_data)
+
+def extract_page_range(source, start, stop, extract_tables=False):
+    """
+    Worker entry point: re-open the PDF and extract pages [start, stop).
+    pdfplumber objects aren't picklable, so each worker opens its own copy.
+    """
+    pdf_path, shm_name, size = source
+    if shm_name:
+        shm = SharedMemory(name=shm_name)
         try:
-            # Extract text from page
-            page_text = page.extract_text() or ""
-            
-            # Extract tables if any
-            tables = []
+            pdf_file = io.BytesIO(bytes(shm.buf[:size]))
+        finally:
+            shm.close()
+    else:
+        pdf_file = pdf_path
+    
+    with pdfplumber.open(pdf_file) as pdf:
+        return [extract_page(pdf.pages[page_num], page_num, extract_tables) for page_num in range(start, stop)]
+
+def extract_from_pdf_object(pdf, extract_tables=False):
+    """
+    Extract text and metadata from pdfplumber PDF object.
+    Table detection is costly and only runs when extract_tables is set.
+    """
+    pages_data = [extract_page(page, page_num, extract_tables) for page_num, page in enumerate(pdf.pages)]
+    return build_result(pages_data)
+
+def extract_page(page, page_num, extract_tables=False):
+    """
+    Extract text (and optionally tables) from a single page
+    """
+    try:
+        # Extract text from page
+        page_text = page.extract_text() or ""
+        
+        # Extract tables if any
+        tables = []
+        if extract_tables:
             try:
                 page_tables = page.extract_tables()
                 if page_tables:
@@ -55,38 +167,52 @@ def extract_from_pdf_object(pdf):
                             tables.append(table_text)
             except:
                 pass  # Tables extraction can fail, continue without them
-            
-            page_data = {
-                "page_number": page_num + 1,
-                "text": page_text,
-                "tables": tables,
-                "char_count": len(page_text)
-            }
-            
-            pages_data.append(page_data)
-            total_text += page_text + "\n\f\n"  # Page separator
-            
-        except Exception as e:
-            # If individual page fails, add error info but continue
-            page_data = {
-                "page_number": page_num + 1,
-                "text": "",
-                "tables": [],
-                "char_count": 0,
-                "error": str(e)
-            }
-            pages_data.append(page_data)
+        
+        return {
+            "page_number": page_num + 1,
+            "text": page_text,
+            "tables": tables,
+            "char_count": len(page_text)
+        }
+        
+    except Exception as e:
+        # If individual page fails, add error info but continue
+        return {
+            "page_number": page_num + 1,
+            "text": "",
+            "tables": [],
+            "char_count": 0,
+            "error": str(e)
+        }
+
+def build_result(pages_data):
+    """
+    Assemble the JSON result from per-page data in page order
+    """
+    text_parts = []
+    pages_with_text = 0
+    pages_with_errors = 0
+    
+    for page_data in pages_data:
+        if "error" in page_data:
+            pages_with_errors += 1
+            continue
+        text_parts.append(page_data["text"])
+        pages_with_text += int(bool(page_data["text"]))
+    
+    # Join once with the page separator instead of growing a string per page
+    total_text = "\n\f\n".join(text_parts).strip()
     
     return {
         "success": True,
-        "total_pages": len(pdf.pages),
-        "total_text": total_text.strip(),
+        "total_pages": len(pages_data),
+        "total_text": total_text,
         "pages": pages_data,
-        "total_chars": len(total_text.strip()),
+        "total_chars": len(total_text),
         "metadata": {
-            "has_text": len(total_text.strip()) > 0,
-            "pages_with_text": len([p for p in pages_data if p["char_count"] > 0]),
-            "pages_with_errors": len([p for p in pages_data if "error" in p])
+            "has_text": len(total_text) > 0,
+            "pages_with_text": pages_with_text,
+            "pages_with_errors": pages_with_errors
         }
     }
 
@@ -94,14 +220,18 @@ def main():
     """
     Main function - can be called with file path or read from stdin
     """
+    parser = argparse.ArgumentParser(description="Extract text from a PDF file or stdin")
+    parser.add_argument("pdf_path", nargs="?", help="PDF file path (reads stdin if omitted)")
+    parser.add_argument("--tables", action="store_true", help="Also extract tables from each page")
+    args = parser.parse_args()
+    
     try:
-        if len(sys.argv) > 1:
+        if args.pdf_path:
             # File path provided as argument
-            pdf_path = sys.argv[1]
-            result = extract_pdf_text(pdf_path)
+            result = extract_pdf_text(args.pdf_path, args.tables)
         else:
             # Read PDF bytes from stdin
-            result = extract_pdf_text(None)
+            result = extract_pdf_text(None, args.tables)
         
         # Output JSON result
         print(json.dumps(result, indent=2))